@@ -2,16 +2,161 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+import contextlib
+import hashlib
+import hmac
 import json
+import os
+import tempfile
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+# A list of user records plus an index of those records by username.
+_UserStore = Tuple[List[Dict[str, str]], Dict[str, Dict[str, str]]]
+
+_SALT_SIZE = 16
+_HASH_SIZE = 32
+_SCRYPT_PARAMS = {"n": 2**14, "r": 8, "p": 1}
+
+# Hashed against when a username is unknown, keeping failures constant-time.
+_DUMMY_SALT = b"\0" * _SALT_SIZE
+_DUMMY_HASH = b"\0" * _HASH_SIZE
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, using ``orjson`` when it is installed."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize ``obj`` to compact JSON bytes, using ``orjson`` when installed."""
+
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _hash_password(password: str, salt: bytes) -> bytes:
+    """Derive a fixed-size password hash with scrypt."""
+
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, dklen=_HASH_SIZE, **_SCRYPT_PARAMS
+    )
+
+
+def _verify_password(user: Dict[str, str], password: str) -> bool:
+    """Return True if ``password`` matches the stored ``user`` record."""
+
+    if "hash" not in user:
+        # Legacy record holding a plaintext password. Hash anyway so the
+        # response time matches that of a hashed record.
+        hmac.compare_digest(_hash_password(password, _DUMMY_SALT), _DUMMY_HASH)
+        stored = str(user.get("password", "")).encode("utf-8")
+        return hmac.compare_digest(stored, password.encode("utf-8"))
+
+    try:
+        salt = base64.b64decode(user["salt"], validate=True)
+        expected = base64.b64decode(user["hash"], validate=True)
+    except (KeyError, TypeError, binascii.Error):
+        return False
+
+    return hmac.compare_digest(_hash_password(password, salt), expected)
+
+
+def _hashed_record(username: str, password: str) -> Dict[str, str]:
+    """Build a user record storing a freshly salted hash of ``password``."""
+
+    salt = os.urandom(_SALT_SIZE)
+    return {
+        "username": username,
+        "salt": base64.b64encode(salt).decode("ascii"),
+        "hash": base64.b64encode(_hash_password(password, salt)).decode("ascii"),
+    }
+
+
+def _upgrade_record(user: Dict[str, str]) -> Dict[str, str]:
+    """Return ``user`` with a legacy plaintext password replaced by a hash."""
+
+    if "hash" in user or "password" not in user:
+        return user
+    return _hashed_record(str(user.get("username", "")), str(user["password"]))
+
+
+def _encode_users(users: List[Dict[str, str]]) -> bytes:
+    """Serialize user records as JSON Lines, one record per line."""
+
+    return b"".join(_dumps(user) + b"\n" for user in users)
+
+
+def _decode_users(data: bytes) -> Tuple[List[Dict[str, str]], List[bytes]]:
+    """Parse JSON Lines user records.
+
+    Return the records and, separately, the raw lines that are not records,
+    such as a torn write or a hand-edit typo. Blank lines are dropped.
+    """
+
+    users = []
+    unparsed = []
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = _loads(line)
+        except ValueError:
+            record = None
+        if isinstance(record, dict):
+            users.append(record)
+        else:
+            unparsed.append(line)
+    return users, unparsed
+
+
+def _decode_legacy_users(data: bytes) -> List[Dict[str, str]] | None:
+    """Parse a legacy store holding one JSON array, or None if it is malformed.
+
+    Plaintext passwords in the array are hashed on the way in.
+    """
+
+    try:
+        records = _loads(data)
+    except ValueError:
+        return None
+    if not isinstance(records, list):
+        return None
+    return [_upgrade_record(record) for record in records if isinstance(record, dict)]
 
 
 class AuthManager:
-    """Manages user authentication against a local JSON file."""
+    """Manages user authentication against a local JSON Lines file.
+
+    Each line of the store holds one user record, so registering a user is a
+    single append rather than a rewrite of every record.
+    """
 
-    def __init__(self, storage_path: str | Path = "users.json") -> None:
+    def __init__(self, storage_path: str | Path = "users.jsonl") -> None:
         self.storage_path = Path(storage_path)
+        # Plain string path for the os-level calls on the hot path.
+        self._path_str = os.fspath(self.storage_path)
+        # (st_mtime_ns, st_size, users, username -> user) of the last parsed
+        # store contents.
+        self._cache: (
+            Tuple[int, int, List[Dict[str, str]], Dict[str, Dict[str, str]]] | None
+        ) = None
+        # Users and index being accumulated inside ``batch()``; None otherwise.
+        self._pending: _UserStore | None = None
+        # Lines of the store that are not user records. A full rewrite keeps
+        # them verbatim, so one bad line is never turned into lost data.
+        self._unparsed: List[bytes] = []
         self._ensure_store_exists()
 
     def authenticate(self, username: str, password: str) -> bool:
@@ -20,11 +165,19 @@ class AuthManager:
         if not username or not password:
             return False
 
-        users = self._load_users()
-        return any(
-            user.get("username") == username and user.get("password") == password
-            for user in users
-        )
+        # Look the user up in O(1), then compare fixed-size hashes in constant
+        # time. An unknown username still pays for one hash so the response
+        # time does not reveal which usernames exist.
+        user = self._load_index().get(username)
+        if user is None:
+            hmac.compare_digest(_hash_password(password, _DUMMY_SALT), _DUMMY_HASH)
+            return False
+
+        if not _verify_password(user, password):
+            return False
+        if "hash" not in user and self._pending is None:
+            self._rehash_legacy_user(user, password)
+        return True
 
     def register(self, username: str, password: str) -> bool:
         """Register a new user. Return True if successful, False if user already exists."""
@@ -32,42 +185,244 @@ class AuthManager:
         if not username or not password:
             return False
 
-        users = self._load_users()
+        users, index = self._load_store()
 
         # Check if username already exists
-        if any(user.get("username") == username for user in users):
+        if username in index:
             return False
 
         # Add the new user
-        users.append({"username": username, "password": password})
+        user = _hashed_record(username, password)
+        while True:
+            users.append(user)
+            index[username] = user
+            if self._pending is not None or self._append_users(users, [user]):
+                return True
+            # Another writer changed the store after it was loaded; check the
+            # username again against what is on disk now.
+            users, index = self._load_store()
+            if username in index:
+                return False
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer writes from ``register`` until the block exits, then save once.
+
+        If another writer registers one of the same usernames meanwhile, its
+        record is kept and the batched one is dropped.
+        """
+
+        if self._pending is not None:
+            yield
+            return
+
+        users, index = self._load_store()
+        saved_count = len(users)
+        self._pending = (users, index)
+        try:
+            yield
+        finally:
+            self._pending = None
+            new_users = users[saved_count:]
+            while new_users and not self._append_users(users, new_users):
+                # The store changed during the batch; append only the users
+                # whose names are still free.
+                users, index = self._load_store()
+                new_users = [
+                    user for user in new_users if user["username"] not in index
+                ]
+                users.extend(new_users)
+                index.update((user["username"], user) for user in new_users)
+
+    def _rehash_legacy_user(self, user: Dict[str, str], password: str) -> None:
+        """Replace a verified plaintext ``user`` record with a hashed one."""
+
+        username = str(user.get("username", ""))
+        users, index = self._load_store()
+        if index.get(username) is not user:
+            return
+        # Update in place so the cached list and index both see the new record.
+        user.clear()
+        user.update(_hashed_record(username, password))
         self._save_users(users)
-        return True
 
     def _ensure_store_exists(self) -> None:
-        """Create the storage file if missing or empty."""
+        """Create the storage file if it is missing."""
 
-        if not self.storage_path.exists():
-            self.storage_path.write_text("[]", encoding="utf-8")
-            return
+        # An existing store costs a single stat and is not opened.
+        try:
+            os.stat(self._path_str)
+        except FileNotFoundError:
+            self._create_store()
+
+    def _create_store(self) -> None:
+        """Create the missing storage file.
+
+        For a ``.jsonl`` store, a store saved under the old ``.json`` name next
+        to it is imported once, so existing accounts survive the rename. The
+        old file is removed once its records are saved, hashed, in the new one.
+        """
 
-        if not self.storage_path.read_text(encoding="utf-8").strip():
-            self.storage_path.write_text("[]", encoding="utf-8")
+        if self.storage_path.suffix == ".jsonl":
+            legacy_path = self.storage_path.with_suffix(".json")
+            try:
+                data = legacy_path.read_bytes()
+            except OSError:
+                data = None
+            users = _decode_legacy_users(data) if data is not None else None
+            if users is not None:
+                self._save_users(users)
+                if self._cache is not None:
+                    with contextlib.suppress(OSError):
+                        os.unlink(legacy_path)
+                # On failure, leave the new store missing so the next start
+                # retries the import.
+                return
+
+        # Opening for append creates the file without truncating one that
+        # appeared meanwhile.
+        with open(self._path_str, "ab"):
+            pass
 
     def _load_users(self) -> List[Dict[str, str]]:
         """Load user records from disk."""
 
+        return self._load_store()[0]
+
+    def _load_index(self) -> Dict[str, Dict[str, str]]:
+        """Return a mapping of usernames to their user records."""
+
+        return self._load_store()[1]
+
+    def _load_store(self) -> _UserStore:
+        """Load users and their index, re-reading the file only when it changed."""
+
+        if self._pending is not None:
+            return self._pending
+
         try:
-            raw = self.storage_path.read_text(encoding="utf-8")
-            return json.loads(raw)
-        except (OSError, json.JSONDecodeError):
-            return []
+            st = os.stat(self._path_str)
+        except OSError:
+            self._cache = None
+            return [], {}
+
+        cache = self._cache
+        if cache is not None and cache[:2] == (st.st_mtime_ns, st.st_size):
+            return cache[2], cache[3]
+
+        try:
+            with open(self._path_str, "rb") as store:
+                data = store.read()
+        except OSError:
+            self._cache = None
+            return [], {}
+
+        if data.lstrip().startswith(b"["):
+            return self._migrate_legacy_store(st, data)
+
+        users, self._unparsed = _decode_users(data)
+        return self._update_cache(st, users)
+
+    def _migrate_legacy_store(self, st: os.stat_result, data: bytes) -> _UserStore:
+        """Rewrite a store holding a single JSON array as JSON Lines."""
+
+        users = _decode_legacy_users(data)
+        if users is None:
+            # Not a valid array after all; read it line by line instead, so a
+            # later write keeps every line.
+            users, self._unparsed = _decode_users(data)
+            return self._update_cache(st, users)
+
+        self._unparsed = []
+        self._save_users(users)
+        if self._cache is not None:
+            return self._cache[2], self._cache[3]
+
+        # The rewrite failed; keep serving the legacy contents, but leave the
+        # cache empty so the next write rewrites the file rather than appending.
+        users, index = self._update_cache(st, users)
+        self._cache = None
+        return users, index
 
     def _save_users(self, users: List[Dict[str, str]]) -> None:
-        """Save user records to disk."""
+        """Atomically replace the stored user records with ``users``.
+
+        Lines that were not user records are written back unchanged after them.
+        """
 
+        data = _encode_users(users) + b"".join(line + b"\n" for line in self._unparsed)
         try:
-            self.storage_path.write_text(
-                json.dumps(users, indent=4), encoding="utf-8"
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f".{self.storage_path.name}.", dir=self.storage_path.parent
             )
         except OSError:
-            pass
+            self._cache = None
+            return
+
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, self._path_str)
+            st = os.stat(self._path_str)
+        except OSError:
+            self._cache = None
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            return
+
+        self._update_cache(st, users)
+
+    def _append_users(
+        self, users: List[Dict[str, str]], new_users: List[Dict[str, str]]
+    ) -> bool:
+        """Append ``new_users`` to the store, whose records are now ``users``.
+
+        Return False without writing if the file changed since it was loaded,
+        so the caller can reload it and check its records again.
+        """
+
+        cache = self._cache
+        if cache is None or cache[2] is not users:
+            # What is on disk is unknown, so appending could corrupt it.
+            self._save_users(users)
+            return True
+
+        data = _encode_users(new_users)
+        try:
+            # "a+b" appends every write but also allows reading the last byte.
+            with open(self._path_str, "a+b") as store:
+                st = os.fstat(store.fileno())
+                if (st.st_mtime_ns, st.st_size) != cache[:2]:
+                    return False
+                if st.st_size and os.pread(store.fileno(), 1, st.st_size - 1) != b"\n":
+                    # Terminate a hand-edited or torn last line so the new
+                    # records do not run into it.
+                    data = b"\n" + data
+                store.write(data)
+                store.flush()
+                st_after = os.fstat(store.fileno())
+        except OSError:
+            self._cache = None
+            return True
+
+        if st_after.st_size != st.st_size + len(data):
+            # Another writer appended at the same time; reload on next use.
+            self._cache = None
+        else:
+            self._cache = (st_after.st_mtime_ns, st_after.st_size, users, cache[3])
+        return True
+
+    def _update_cache(
+        self, st: os.stat_result, users: List[Dict[str, str]]
+    ) -> _UserStore:
+        """Remember ``users`` as the contents of the store described by ``st``."""
+
+        # The first record for a username wins, so a duplicate appended later
+        # cannot take over an existing account.
+        index: Dict[str, Dict[str, str]] = {}
+        for user in users:
+            index.setdefault(str(user.get("username", "")), user)
+        self._cache = (st.st_mtime_ns, st.st_size, users, index)
+        return users, index
@@ -2,10 +2,34 @@
 
 from __future__ import annotations
 
-from typing import Callable, Dict
+import functools
+import sys
+from pathlib import Path
 
 from auth import AuthManager
 
+_WELCOME_BANNER = "Welcome to the CLI To-Do List App!\n"
+_PRE_LOGIN_MENU = "\nPlease choose an action:\n[1] Login\n[2] Sign Up\n[3] Exit\n"
+_PRE_LOGIN_CHOICES = frozenset({"1", "2", "3"})
+
+
+def _prompt(message: str) -> str:
+    """Display ``message`` and return the next line of input, stripped."""
+
+    sys.stdout.write(message)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.strip()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_auth_manager(storage_path: str) -> AuthManager:
+    """Return the shared ``AuthManager`` for a resolved storage path."""
+
+    return AuthManager(storage_path)
+
 
 class App:
     """A simple REPL-like CLI shell."""
@@ -13,45 +37,44 @@ class App:
     def __init__(self, auth_manager: AuthManager | None = None) -> None:
         self._running = True
         self._current_user: str | None = None
-        self._auth = auth_manager or AuthManager()
-        self._actions: Dict[str, Callable[[], None]] = {
-            "1": self._handle_login,
-            "2": self._handle_sign_up,
-            "3": self._exit_application,
-        }
+        self._auth = auth_manager or _get_auth_manager(
+            str(Path("users.jsonl").resolve())
+        )
 
     def run(self) -> None:
         """Start the main application loop."""
 
-        print("Welcome to the CLI To-Do List App!")
+        sys.stdout.write(_WELCOME_BANNER)
         while self._running:
             self._print_pre_login_menu()
-            choice = input("Select an option: ").strip()
+            choice = _prompt("Select an option: ")
             self._dispatch(choice)
 
     def _print_pre_login_menu(self) -> None:
         """Display the pre-login menu options."""
 
-        print("\nPlease choose an action:")
-        print("[1] Login")
-        print("[2] Sign Up")
-        print("[3] Exit")
+        sys.stdout.write(_PRE_LOGIN_MENU)
 
     def _dispatch(self, choice: str) -> None:
         """Execute the action mapped to the provided menu choice."""
 
-        action = self._actions.get(choice)
-        if action is None:
+        if choice not in _PRE_LOGIN_CHOICES:
             print("Invalid selection. Please enter 1, 2, or 3.")
             return
 
-        action()
+        match choice:
+            case "1":
+                self._handle_login()
+            case "2":
+                self._handle_sign_up()
+            case "3":
+                self._exit_application()
 
     def _handle_login(self) -> None:
         """Authenticate a user against the stored credentials."""
 
-        username = input("Username: ").strip()
-        password = input("Password: ").strip()
+        username = _prompt("Username: ")
+        password = _prompt("Password: ")
 
         if self._auth.authenticate(username, password):
             self._current_user = username
@@ -63,9 +86,9 @@ class App:
     def _handle_sign_up(self) -> None:
         """Create a new user account."""
 
-        username = input("Username: ").strip()
-        password = input("Password: ").strip()
-        confirm_password = input("Confirm Password: ").strip()
+        username = _prompt("Username: ")
+        password = _prompt("Password: ")
+        confirm_password = _prompt("Confirm Password: ")
 
         if not username or not password:
             print("Username and password cannot be empty.")
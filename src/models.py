@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import functools
+import operator
+from dataclasses import dataclass, fields
 from datetime import datetime
-from enum import Enum
-from typing import Any, Dict
+from enum import StrEnum
+from typing import Any, Callable, Dict, Tuple
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
 
-class Priority(Enum):
+
+class Priority(StrEnum):
     """Represents the urgency of a to-do item."""
 
     HIGH = "HIGH"
@@ -16,14 +23,60 @@ class Priority(Enum):
     LOW = "LOW"
 
 
-class Status(Enum):
+class Status(StrEnum):
     """Represents the completion status of a to-do item."""
 
     PENDING = "PENDING"
     COMPLETED = "COMPLETED"
 
 
-@dataclass
+@functools.lru_cache(maxsize=None)
+def _priority(value: str) -> Priority:
+    """Return the ``Priority`` for ``value``, memoized per distinct string."""
+
+    return Priority(value)
+
+
+@functools.lru_cache(maxsize=None)
+def _status(value: str) -> Status:
+    """Return the ``Status`` for ``value``, memoized per distinct string."""
+
+    return Status(value)
+
+
+def _isoformat(value: datetime) -> str:
+    """Format ``value`` as ISO-8601, using ``orjson`` when it is installed."""
+
+    if orjson is None or type(value) is not datetime:
+        # orjson rejects datetime subclasses, such as test-clock fakes.
+        return value.isoformat()
+    offset = value.utcoffset()
+    if offset is None or (offset.seconds % 60 == 0 and not offset.microseconds):
+        # orjson emits the same text as isoformat(), wrapped in JSON quotes,
+        # but truncates offsets to whole minutes.
+        return orjson.dumps(value).decode("ascii")[1:-1]
+    return value.isoformat()
+
+
+# Timestamps repeat across records and round trips; datetimes are immutable,
+# so sharing parsed instances is safe.
+_parse_datetime = functools.lru_cache(maxsize=1024)(datetime.fromisoformat)
+
+
+# Converters ``from_dict`` applies to serialized fields. Fields not listed here
+# are stored as plain strings and copied unchanged.
+_FROM_DICT_CONVERTERS: Tuple[Tuple[str, Callable[[Any], Any]], ...] = (
+    ("priority", _priority),
+    ("status", _status),
+    ("created_at", _parse_datetime),
+    ("updated_at", _parse_datetime),
+)
+
+# Fields that may be missing from serialized data, with the value to use then.
+_FROM_DICT_DEFAULTS: Dict[str, Any] = {"details": ""}
+
+
+@dataclass(slots=True, frozen=True)
 class TodoItem:
     """A single to-do item owned by a user."""
 
@@ -39,28 +92,72 @@ class TodoItem:
     def to_dict(self) -> Dict[str, Any]:
         """Serialize the item into a JSON-friendly dictionary."""
 
+        (
+            id_,
+            title,
+            details,
+            priority,
+            status,
+            owner,
+            created_at,
+            updated_at,
+        ) = _TODO_FIELDS(self)
         return {
-            "id": self.id,
-            "title": self.title,
-            "details": self.details,
-            "priority": self.priority.value,
-            "status": self.status.value,
-            "owner": self.owner,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "id": id_,
+            "title": title,
+            "details": details,
+            # StrEnum members are already strings, so they serialize as is.
+            "priority": priority,
+            "status": status,
+            "owner": owner,
+            "created_at": _isoformat(created_at),
+            "updated_at": _isoformat(updated_at),
         }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TodoItem":
         """Create a ``TodoItem`` from a dictionary representation."""
 
-        return cls(
-            id=str(data["id"]),
-            title=str(data["title"]),
-            details=str(data.get("details", "")),
-            priority=Priority(str(data["priority"])),
-            status=Status(str(data["status"])),
-            owner=str(data["owner"]),
-            created_at=datetime.fromisoformat(str(data["created_at"])),
-            updated_at=datetime.fromisoformat(str(data["updated_at"])),
-        )
+        return _from_dict(cls, data)
+
+
+_TODO_FIELDS = operator.attrgetter(
+    "id",
+    "title",
+    "details",
+    "priority",
+    "status",
+    "owner",
+    "created_at",
+    "updated_at",
+)
+
+
+def _compile_from_dict() -> Callable[[type, Dict[str, Any]], TodoItem]:
+    """Generate a straight-line ``from_dict`` body from the field converters.
+
+    Like the ``__init__`` that ``@dataclass`` synthesizes, the source is built
+    and ``exec``-ed once at import, so each call is a single constructor call
+    with positional arguments and no per-field loop.
+    """
+
+    converters = dict(_FROM_DICT_CONVERTERS)
+    namespace: Dict[str, Any] = {"_defaults": _FROM_DICT_DEFAULTS}
+    args = []
+    for todo_field in fields(TodoItem):
+        name = todo_field.name
+        if name in _FROM_DICT_DEFAULTS:
+            value = f"data.get({name!r}, _defaults[{name!r}])"
+        else:
+            value = f"data[{name!r}]"
+        if name in converters:
+            namespace[f"_convert_{name}"] = converters[name]
+            value = f"_convert_{name}({value})"
+        args.append(value)
+
+    source = f"def _from_dict(cls, data):\n    return cls({', '.join(args)})\n"
+    exec(source, namespace)
+    return namespace["_from_dict"]
+
+
+_from_dict = _compile_from_dict()
@@ -1,25 +1,38 @@
 """Unit tests for authentication functionality."""
 
+import base64
 import json
 import tempfile
 from pathlib import Path
+from typing import Dict
+from unittest.mock import patch
 
 import pytest
 
+import auth
 from auth import AuthManager
 
 
+@pytest.fixture(scope="session")
+def users_store_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create one user storage file shared by the whole test session."""
+    return tmp_path_factory.mktemp("auth") / "users.jsonl"
+
+
+@pytest.fixture(autouse=True)
+def fast_password_hashing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Use cheap scrypt parameters so hashing does not dominate test time."""
+    monkeypatch.setattr(auth, "_SCRYPT_PARAMS", {"n": 2**4, "r": 1, "p": 1})
+
+
 class TestAuthManager:
     """Tests for the AuthManager class."""
 
     @pytest.fixture
-    def temp_users_file(self) -> Path:
-        """Create a temporary file for user storage."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump([], f)
-            temp_path = Path(f.name)
-        yield temp_path
-        temp_path.unlink()
+    def temp_users_file(self, users_store_path: Path) -> Path:
+        """Reset the shared user storage file to an empty store."""
+        users_store_path.write_bytes(b"")
+        return users_store_path
 
     @pytest.fixture
     def auth_manager(self, temp_users_file: Path) -> AuthManager:
@@ -34,24 +47,94 @@ class TestAuthManager:
     def test_ensure_store_exists_creates_file(self) -> None:
         """Test that _ensure_store_exists creates a file if missing."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            storage_path = Path(tmpdir) / "new_users.json"
+            storage_path = Path(tmpdir) / "new_users.jsonl"
             AuthManager(storage_path=storage_path)
             assert storage_path.exists()
-            assert json.loads(storage_path.read_text()) == []
+            assert storage_path.read_bytes() == b""
+
+    def test_ensure_store_exists_imports_legacy_json_file(self, tmp_path: Path) -> None:
+        """Test a sibling users.json store is migrated when users.jsonl is new."""
+        legacy = [{"username": "user1", "password": "pass1"}]
+        (tmp_path / "users.json").write_text(json.dumps(legacy, indent=4))
+        storage_path = tmp_path / "users.jsonl"
+
+        auth_manager = AuthManager(storage_path=storage_path)
+
+        lines = storage_path.read_bytes().splitlines()
+        assert [json.loads(line)["username"] for line in lines] == ["user1"]
+        assert "password" not in json.loads(lines[0])
+        assert auth_manager.authenticate("user1", "pass1") is True
+        assert not (tmp_path / "users.json").exists()
+
+    def test_ensure_store_exists_keeps_legacy_file_when_import_fails(
+        self, tmp_path: Path
+    ) -> None:
+        """Test users.json is left in place if the new store cannot be written."""
+        legacy = json.dumps([{"username": "user1", "password": "pass1"}])
+        (tmp_path / "users.json").write_text(legacy)
+
+        storage_path = tmp_path / "users.jsonl"
+        with patch("auth.os.replace", side_effect=OSError):
+            AuthManager(storage_path=storage_path)
+
+        assert (tmp_path / "users.json").read_text() == legacy
+        assert not storage_path.exists()
+        assert AuthManager(storage_path).authenticate("user1", "pass1") is True
+
+    def test_ensure_store_exists_imports_only_for_jsonl_store(
+        self, tmp_path: Path
+    ) -> None:
+        """Test a store with another suffix never imports a sibling .json file."""
+        legacy = json.dumps([{"username": "user1", "password": "pass1"}])
+        (tmp_path / "creds.json").write_text(legacy)
+        storage_path = tmp_path / "creds.db"
+
+        auth_manager = AuthManager(storage_path=storage_path)
+
+        assert storage_path.read_bytes() == b""
+        assert auth_manager.authenticate("user1", "pass1") is False
+        assert (tmp_path / "creds.json").read_text() == legacy
+
+    def test_ensure_store_exists_ignores_legacy_file_once_migrated(
+        self, tmp_path: Path
+    ) -> None:
+        """Test an existing users.jsonl is never overwritten from users.json."""
+        (tmp_path / "users.json").write_text(
+            json.dumps([{"username": "stale", "password": "pass1"}])
+        )
+        storage_path = tmp_path / "users.jsonl"
+        storage_path.write_bytes(b"")
+
+        auth_manager = AuthManager(storage_path=storage_path)
+
+        assert storage_path.read_bytes() == b""
+        assert auth_manager.authenticate("stale", "pass1") is False
 
     def test_ensure_store_exists_with_empty_file(self) -> None:
-        """Test that _ensure_store_exists initializes empty files."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        """Test that an existing empty file is used as an empty store."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
             f.write("")
             temp_path = Path(f.name)
 
         try:
-            AuthManager(storage_path=temp_path)
-            content = json.loads(temp_path.read_text())
-            assert content == []
+            auth_manager = AuthManager(storage_path=temp_path)
+            assert temp_path.read_bytes() == b""
+            assert auth_manager._load_users() == []
         finally:
             temp_path.unlink()
 
+    def test_ensure_store_exists_does_not_open_existing_store(
+        self, temp_users_file: Path
+    ) -> None:
+        """Test an existing store is checked with one stat and never opened."""
+        with patch("auth.os.stat", wraps=auth.os.stat) as mock_stat, patch(
+            "builtins.open"
+        ) as mock_open:
+            AuthManager(storage_path=temp_users_file)
+
+        mock_stat.assert_called_once_with(str(temp_users_file))
+        mock_open.assert_not_called()
+
     def test_register_new_user(self, auth_manager: AuthManager) -> None:
         """Test registering a new user successfully."""
         result = auth_manager.register("newuser", "password123")
@@ -60,7 +143,9 @@ class TestAuthManager:
         users = auth_manager._load_users()
         assert len(users) == 1
         assert users[0]["username"] == "newuser"
-        assert users[0]["password"] == "password123"
+        assert "password" not in users[0]
+        assert len(base64.b64decode(users[0]["salt"])) == 16
+        assert len(base64.b64decode(users[0]["hash"])) == 32
 
     def test_register_duplicate_username(self, auth_manager: AuthManager) -> None:
         """Test that registering duplicate username fails."""
@@ -122,3 +207,369 @@ class TestAuthManager:
         assert auth_manager.authenticate("user2", "pass2") is True
         assert auth_manager.authenticate("user3", "pass3") is True
         assert auth_manager.authenticate("user1", "pass2") is False
+
+    def test_authenticate_non_ascii_credentials(
+        self, auth_manager: AuthManager
+    ) -> None:
+        """Test authenticating with non-ASCII usernames and passwords."""
+        auth_manager.register("zoë", "pässwörd")
+        assert auth_manager.authenticate("zoë", "pässwörd") is True
+        assert auth_manager.authenticate("zoë", "passwörd") is False
+
+    def test_load_users_reuses_cache_when_unchanged(
+        self, auth_manager: AuthManager
+    ) -> None:
+        """Test that an unchanged store is not parsed again."""
+        auth_manager.register("testuser", "testpass")
+
+        with patch("auth._loads") as mock_loads:
+            users = auth_manager._load_users()
+
+        mock_loads.assert_not_called()
+        assert users[0]["username"] == "testuser"
+
+    def test_load_users_reloads_after_external_change(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test that edits made outside the manager are picked up."""
+        auth_manager.register("testuser", "testpass")
+        temp_users_file.write_text(
+            json.dumps([{"username": "other", "password": "secret123"}])
+        )
+
+        assert auth_manager.authenticate("other", "secret123") is True
+        assert auth_manager.authenticate("testuser", "testpass") is False
+
+    def test_load_index_maps_usernames_to_records(
+        self, auth_manager: AuthManager
+    ) -> None:
+        """Test the username index stays in sync with registrations."""
+        auth_manager.register("user1", "pass1")
+        auth_manager.register("user2", "pass2")
+
+        index = auth_manager._load_index()
+        assert set(index) == {"user1", "user2"}
+        assert index["user1"] is auth_manager._load_users()[0]
+
+    def test_register_appends_one_line(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test registering appends a record instead of rewriting the store."""
+        auth_manager.register("user1", "pass1")
+
+        with patch.object(auth_manager, "_save_users") as mock_save:
+            auth_manager.register("user2", "pass2")
+
+        mock_save.assert_not_called()
+        lines = temp_users_file.read_bytes().splitlines()
+        assert [json.loads(line)["username"] for line in lines] == ["user1", "user2"]
+
+    def test_register_after_missing_trailing_newline(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a store whose last line lacks a newline keeps both records."""
+        auth_manager.register("user1", "pass1")
+        temp_users_file.write_bytes(temp_users_file.read_bytes().rstrip(b"\n"))
+
+        auth_manager.register("user2", "pass2")
+
+        fresh_manager = AuthManager(temp_users_file)
+        assert fresh_manager.authenticate("user1", "pass1") is True
+        assert fresh_manager.authenticate("user2", "pass2") is True
+
+    def test_register_after_torn_last_line(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a record appended after a torn write is not glued onto it."""
+        auth_manager.register("user1", "pass1")
+        with open(temp_users_file, "ab") as store:
+            store.write(b'{"username":"torn","sa')
+
+        auth_manager.register("user2", "pass2")
+
+        fresh_manager = AuthManager(temp_users_file)
+        assert fresh_manager.authenticate("user1", "pass1") is True
+        assert fresh_manager.authenticate("user2", "pass2") is True
+
+    def test_save_users_replaces_store_atomically(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test saving writes JSON Lines and leaves no temporary files."""
+        users = [{"username": "user1", "salt": "c2FsdA==", "hash": "aGFzaA=="}]
+        auth_manager._save_users(users)
+
+        assert temp_users_file.read_bytes() == (
+            b'{"username":"user1","salt":"c2FsdA==","hash":"aGFzaA=="}\n'
+        )
+        leftovers = list(temp_users_file.parent.glob(f".{temp_users_file.name}.*"))
+        assert leftovers == []
+
+    def test_save_users_failure_keeps_existing_store(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a failed replace leaves the previous contents intact."""
+        auth_manager.register("testuser", "testpass")
+        before = temp_users_file.read_bytes()
+
+        with patch("auth.os.replace", side_effect=OSError):
+            auth_manager._save_users([])
+
+        assert temp_users_file.read_bytes() == before
+        assert auth_manager.authenticate("testuser", "testpass") is True
+
+    def test_load_users_migrates_legacy_json_array(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a store saved as one JSON array is rewritten as hashed JSON Lines."""
+        legacy = [
+            {"username": "user1", "password": "pass1"},
+            {"username": "user2", "password": "pass2"},
+        ]
+        temp_users_file.write_text(json.dumps(legacy, indent=4))
+
+        users = auth_manager._load_users()
+        assert [user["username"] for user in users] == ["user1", "user2"]
+        records = [
+            json.loads(line) for line in temp_users_file.read_bytes().splitlines()
+        ]
+        assert records == users
+        for record in records:
+            assert "password" not in record
+            assert set(record) == {"username", "salt", "hash"}
+
+        auth_manager.register("user3", "pass3")
+        assert auth_manager.authenticate("user1", "pass1") is True
+        assert auth_manager.authenticate("user3", "pass3") is True
+
+    def test_load_users_skips_malformed_lines(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a torn or corrupt line does not hide the other records."""
+        temp_users_file.write_bytes(
+            b'{"username":"user1","password":"pass1"}\n'
+            b"\n"
+            b'{"username":"user2","pass\n'
+        )
+
+        users = auth_manager._load_users()
+        assert [user["username"] for user in users] == ["user1"]
+
+    def test_load_users_skips_non_object_records(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test valid JSON that is not a user record is ignored."""
+        temp_users_file.write_bytes(
+            b'123\n["user2"]\n"user3"\n{"username":"user1","password":"pass1"}\n'
+        )
+
+        users = auth_manager._load_users()
+        assert [user["username"] for user in users] == ["user1"]
+        assert auth_manager.authenticate("user2", "anything") is False
+
+    def test_load_users_skips_non_object_legacy_records(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test non-object entries in a legacy JSON array are dropped."""
+        temp_users_file.write_text(
+            json.dumps([123, None, {"username": "user1", "password": "pass1"}])
+        )
+
+        users = auth_manager._load_users()
+        assert [user["username"] for user in users] == ["user1"]
+        assert auth_manager.authenticate("user1", "pass1") is True
+
+    def test_rewrite_keeps_lines_that_are_not_records(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a full rewrite carries malformed lines through unchanged."""
+        temp_users_file.write_bytes(
+            b'{"username":"legacy","password":"oldpass"}\n'
+            b'{"username":"typo",\n'
+            b"123\n"
+        )
+
+        assert auth_manager.authenticate("legacy", "oldpass") is True
+
+        lines = temp_users_file.read_bytes().splitlines()
+        assert set(json.loads(lines[0])) == {"username", "salt", "hash"}
+        assert lines[1:] == [b'{"username":"typo",', b"123"]
+
+    def test_register_keeps_malformed_legacy_array(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a legacy array that fails to parse is not overwritten."""
+        legacy = b'[\n    {"username": "user1", "password": "pass1"},\n]'
+        temp_users_file.write_bytes(legacy)
+
+        assert auth_manager.register("user2", "pass2") is True
+
+        data = temp_users_file.read_bytes()
+        assert data.startswith(legacy + b"\n")
+        assert AuthManager(temp_users_file).authenticate("user2", "pass2") is True
+
+    def test_register_uses_unique_salts(self, auth_manager: AuthManager) -> None:
+        """Test identical passwords are stored under different hashes."""
+        auth_manager.register("user1", "samepass")
+        auth_manager.register("user2", "samepass")
+
+        first, second = auth_manager._load_users()
+        assert first["salt"] != second["salt"]
+        assert first["hash"] != second["hash"]
+
+    def test_authenticate_legacy_plaintext_record(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test records stored before hashing was introduced still authenticate."""
+        temp_users_file.write_bytes(b'{"username":"legacy","password":"oldpass"}\n')
+
+        assert auth_manager.authenticate("legacy", "wrongpass") is False
+        assert auth_manager.authenticate("legacy", "oldpass") is True
+        assert auth_manager.authenticate("legacy", "wrongpass") is False
+
+    def test_authenticate_rehashes_legacy_plaintext_record(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a successful login replaces a plaintext password with a hash."""
+        temp_users_file.write_bytes(
+            b'{"username":"legacy","password":"oldpass"}\n'
+            b'{"username":"other","password":"otherpass"}\n'
+        )
+
+        assert auth_manager.authenticate("legacy", "oldpass") is True
+
+        records = [
+            json.loads(line) for line in temp_users_file.read_bytes().splitlines()
+        ]
+        assert set(records[0]) == {"username", "salt", "hash"}
+        assert records[1] == {"username": "other", "password": "otherpass"}
+        assert AuthManager(temp_users_file).authenticate("legacy", "oldpass") is True
+
+    def test_authenticate_legacy_plaintext_record_still_hashes(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a plaintext record costs one hash, like a hashed record does."""
+        temp_users_file.write_bytes(b'{"username":"legacy","password":"oldpass"}\n')
+
+        with patch("auth._hash_password", wraps=auth._hash_password) as mock_hash:
+            assert auth_manager.authenticate("legacy", "wrongpass") is False
+
+        mock_hash.assert_called_once_with("wrongpass", auth._DUMMY_SALT)
+
+    def test_authenticate_corrupt_hash_record(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a record with a malformed salt or hash never authenticates."""
+        temp_users_file.write_text(
+            json.dumps([{"username": "broken", "salt": "!!", "hash": "!!"}])
+        )
+
+        assert auth_manager.authenticate("broken", "anything") is False
+
+    def test_batch_saves_once(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test registrations inside a batch are written in a single append."""
+        with patch.object(
+            auth_manager, "_append_users", wraps=auth_manager._append_users
+        ) as mock_append:
+            with auth_manager.batch():
+                auth_manager.register("user1", "pass1")
+                auth_manager.register("user2", "pass2")
+                assert auth_manager.register("user1", "other") is False
+                assert auth_manager.authenticate("user2", "pass2") is True
+                assert temp_users_file.read_bytes() == b""
+
+        mock_append.assert_called_once()
+        lines = temp_users_file.read_bytes().splitlines()
+        assert [json.loads(line)["username"] for line in lines] == ["user1", "user2"]
+
+    def test_batch_without_registrations_does_not_write(
+        self, auth_manager: AuthManager
+    ) -> None:
+        """Test an empty batch leaves the store untouched."""
+        with patch.object(auth_manager, "_append_users") as mock_append:
+            with auth_manager.batch():
+                pass
+
+        mock_append.assert_not_called()
+
+    def test_register_rechecks_after_concurrent_registration(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a name taken by another writer while hashing is not registered twice."""
+        hashed_record = auth._hashed_record
+
+        def register_elsewhere(username: str, password: str) -> Dict[str, str]:
+            with open(temp_users_file, "ab") as store:
+                store.write(auth._encode_users([hashed_record("xavier", "pass2")]))
+            return hashed_record(username, password)
+
+        auth_manager.register("user1", "pass1")
+        with patch("auth._hashed_record", side_effect=register_elsewhere):
+            assert auth_manager.register("xavier", "pass1") is False
+
+        assert auth_manager.authenticate("xavier", "pass2") is True
+        assert auth_manager.authenticate("xavier", "pass1") is False
+        lines = temp_users_file.read_bytes().splitlines()
+        assert [json.loads(line)["username"] for line in lines] == ["user1", "xavier"]
+
+    def test_register_keeps_concurrent_registration_visible(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a record appended by another writer is not hidden by the cache."""
+        other_manager = AuthManager(temp_users_file)
+        auth_manager.register("user1", "pass1")
+        hashed_record = auth._hashed_record
+
+        def register_elsewhere(username: str, password: str) -> Dict[str, str]:
+            if username == "user2":
+                other_manager.register("xavier", "pass2")
+            return hashed_record(username, password)
+
+        with patch("auth._hashed_record", side_effect=register_elsewhere):
+            assert auth_manager.register("user2", "pass2") is True
+
+        assert auth_manager.authenticate("xavier", "pass2") is True
+        assert auth_manager.register("xavier", "pass1") is False
+        assert AuthManager(temp_users_file).authenticate("user2", "pass2") is True
+
+    def test_batch_drops_names_taken_during_the_batch(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a batch does not append a name another writer registered first."""
+        with auth_manager.batch():
+            auth_manager.register("user1", "pass1")
+            AuthManager(temp_users_file).register("xavier", "pass2")
+            auth_manager.register("xavier", "pass1")
+
+        lines = temp_users_file.read_bytes().splitlines()
+        assert [json.loads(line)["username"] for line in lines] == ["xavier", "user1"]
+        assert auth_manager.authenticate("xavier", "pass2") is True
+        assert auth_manager.authenticate("user1", "pass1") is True
+
+    def test_load_index_keeps_first_record_for_duplicate_username(
+        self, auth_manager: AuthManager, temp_users_file: Path
+    ) -> None:
+        """Test a later duplicate record cannot take over an existing account."""
+        temp_users_file.write_bytes(
+            auth._encode_users(
+                [
+                    auth._hashed_record("xavier", "pass1"),
+                    auth._hashed_record("xavier", "pass2"),
+                ]
+            )
+        )
+
+        assert auth_manager.authenticate("xavier", "pass1") is True
+        assert auth_manager.authenticate("xavier", "pass2") is False
+
+    def test_authenticate_unknown_user_still_hashes(
+        self, auth_manager: AuthManager
+    ) -> None:
+        """Test unknown usernames cost one hash, like known ones."""
+        auth_manager.register("testuser", "testpass")
+
+        with patch("auth._hash_password", wraps=auth._hash_password) as mock_hash:
+            assert auth_manager.authenticate("nobody", "testpass") is False
+
+        mock_hash.assert_called_once_with("testpass", auth._DUMMY_SALT)
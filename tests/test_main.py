@@ -9,6 +9,11 @@ from auth import AuthManager
 from main import App
 
 
+def _stdin(*lines: str) -> StringIO:
+    """Build a fake stdin that yields ``lines`` one per ``readline`` call."""
+    return StringIO("".join(f"{line}\n" for line in lines))
+
+
 class TestApp:
     """Tests for the App class."""
 
@@ -35,11 +40,9 @@ class TestApp:
         assert app._auth is not None
         assert isinstance(app._auth, AuthManager)
 
-    def test_app_actions_mapping(self, app: App) -> None:
-        """Test App has correct action mappings."""
-        assert "1" in app._actions
-        assert "2" in app._actions
-        assert "3" in app._actions
+    def test_default_auth_manager_is_shared(self) -> None:
+        """Test Apps without an explicit AuthManager share one instance."""
+        assert App()._auth is App()._auth
 
     def test_print_pre_login_menu(self, app: App, capsys: object) -> None:
         """Test pre-login menu is printed correctly."""
@@ -53,24 +56,21 @@ class TestApp:
 
     def test_dispatch_login_action(self, app: App) -> None:
         """Test dispatch routes to login handler."""
-        mock_login = MagicMock()
-        app._actions["1"] = mock_login
-        app._dispatch("1")
-        mock_login.assert_called_once()
+        with patch.object(app, "_handle_login") as mock_login:
+            app._dispatch("1")
+        mock_login.assert_called_once_with()
 
     def test_dispatch_signup_action(self, app: App) -> None:
         """Test dispatch routes to sign up handler."""
-        mock_signup = MagicMock()
-        app._actions["2"] = mock_signup
-        app._dispatch("2")
-        mock_signup.assert_called_once()
+        with patch.object(app, "_handle_sign_up") as mock_signup:
+            app._dispatch("2")
+        mock_signup.assert_called_once_with()
 
     def test_dispatch_exit_action(self, app: App) -> None:
         """Test dispatch routes to exit handler."""
-        mock_exit = MagicMock()
-        app._actions["3"] = mock_exit
-        app._dispatch("3")
-        mock_exit.assert_called_once()
+        with patch.object(app, "_exit_application") as mock_exit:
+            app._dispatch("3")
+        mock_exit.assert_called_once_with()
 
     def test_dispatch_invalid_action(self, app: App, capsys: object) -> None:
         """Test dispatch handles invalid choice gracefully."""
@@ -78,6 +78,17 @@ class TestApp:
         captured = capsys.readouterr()
         assert "Invalid selection" in captured.out
 
+    def test_dispatch_invalid_action_calls_no_handler(self, app: App) -> None:
+        """Test an invalid choice never reaches a menu handler."""
+        with patch.object(app, "_handle_login") as mock_login, patch.object(
+            app, "_handle_sign_up"
+        ) as mock_signup, patch.object(app, "_exit_application") as mock_exit:
+            app._dispatch("1 ")
+
+        mock_login.assert_not_called()
+        mock_signup.assert_not_called()
+        mock_exit.assert_not_called()
+
     def test_dispatch_empty_choice(self, app: App, capsys: object) -> None:
         """Test dispatch handles empty choice."""
         app._dispatch("")
@@ -98,7 +109,7 @@ class TestAppLoginFlow:
         """Test successful login flow."""
         app._auth.authenticate.return_value = True
 
-        with patch("builtins.input", side_effect=["testuser", "password123"]):
+        with patch("sys.stdin", _stdin("testuser", "password123")):
             app._handle_login()
 
         assert app._current_user == "testuser"
@@ -110,7 +121,7 @@ class TestAppLoginFlow:
         """Test failed login attempt."""
         app._auth.authenticate.return_value = False
 
-        with patch("builtins.input", side_effect=["wronguser", "wrongpass"]):
+        with patch("sys.stdin", _stdin("wronguser", "wrongpass")):
             app._handle_login()
 
         assert app._current_user is None
@@ -121,7 +132,7 @@ class TestAppLoginFlow:
         """Test login strips whitespace from inputs."""
         app._auth.authenticate.return_value = True
 
-        with patch("builtins.input", side_effect=["  testuser  ", "  password  "]):
+        with patch("sys.stdin", _stdin("  testuser  ", "  password  ")):
             app._handle_login()
 
         app._auth.authenticate.assert_called_once_with("testuser", "password")
@@ -140,10 +151,7 @@ class TestAppSignupFlow:
         """Test successful sign up flow."""
         app._auth.register.return_value = True
 
-        with patch(
-            "builtins.input",
-            side_effect=["newuser", "password123", "password123"],
-        ):
+        with patch("sys.stdin", _stdin("newuser", "password123", "password123")):
             app._handle_sign_up()
 
         app._auth.register.assert_called_once_with("newuser", "password123")
@@ -152,10 +160,7 @@ class TestAppSignupFlow:
 
     def test_handle_sign_up_passwords_mismatch(self, app: App, capsys: object) -> None:
         """Test sign up fails when passwords don't match."""
-        with patch(
-            "builtins.input",
-            side_effect=["newuser", "password123", "different123"],
-        ):
+        with patch("sys.stdin", _stdin("newuser", "password123", "different123")):
             app._handle_sign_up()
 
         app._auth.register.assert_not_called()
@@ -164,7 +169,7 @@ class TestAppSignupFlow:
 
     def test_handle_sign_up_empty_username(self, app: App, capsys: object) -> None:
         """Test sign up fails with empty username."""
-        with patch("builtins.input", side_effect=["", "password123", "password123"]):
+        with patch("sys.stdin", _stdin("", "password123", "password123")):
             app._handle_sign_up()
 
         app._auth.register.assert_not_called()
@@ -173,7 +178,7 @@ class TestAppSignupFlow:
 
     def test_handle_sign_up_empty_password(self, app: App, capsys: object) -> None:
         """Test sign up fails with empty password."""
-        with patch("builtins.input", side_effect=["newuser", "", ""]):
+        with patch("sys.stdin", _stdin("newuser", "", "")):
             app._handle_sign_up()
 
         app._auth.register.assert_not_called()
@@ -184,10 +189,7 @@ class TestAppSignupFlow:
         """Test sign up fails when username already exists."""
         app._auth.register.return_value = False
 
-        with patch(
-            "builtins.input",
-            side_effect=["existinguser", "password123", "password123"],
-        ):
+        with patch("sys.stdin", _stdin("existinguser", "password123", "password123")):
             app._handle_sign_up()
 
         captured = capsys.readouterr()
@@ -198,8 +200,7 @@ class TestAppSignupFlow:
         app._auth.register.return_value = True
 
         with patch(
-            "builtins.input",
-            side_effect=["  newuser  ", "  password123  ", "  password123  "],
+            "sys.stdin", _stdin("  newuser  ", "  password123  ", "  password123  ")
         ):
             app._handle_sign_up()
 
@@ -235,7 +236,7 @@ class TestAppMainLoop:
 
     def test_run_exits_on_keyboard_interrupt(self, app: App, capsys: object) -> None:
         """Test that KeyboardInterrupt is handled gracefully."""
-        with patch("builtins.input", side_effect=KeyboardInterrupt()):
+        with patch("main._prompt", side_effect=KeyboardInterrupt()):
             from main import main
 
             with patch("builtins.print"):
@@ -247,16 +248,22 @@ class TestAppMainLoop:
 
     def test_run_with_exit_command(self, app: App, capsys: object) -> None:
         """Test run loop exits when user selects exit."""
-        with patch("builtins.input", side_effect=["3"]):
+        with patch("sys.stdin", _stdin("3")):
             app.run()
 
         assert app._running is False
         captured = capsys.readouterr()
         assert "Goodbye!" in captured.out
 
+    def test_run_raises_eof_when_input_ends(self, app: App) -> None:
+        """Test that exhausted input ends the loop like ``input()`` would."""
+        with patch("sys.stdin", _stdin("9")):
+            with pytest.raises(EOFError):
+                app.run()
+
     def test_run_multiple_invalid_choices(self, app: App, capsys: object) -> None:
         """Test run loop handles multiple invalid choices before exit."""
-        with patch("builtins.input", side_effect=["9", "invalid", "3"]):
+        with patch("sys.stdin", _stdin("9", "invalid", "3")):
             app.run()
 
         assert app._running is False
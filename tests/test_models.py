@@ -1,104 +1,127 @@
 """Unit tests for data models and enums."""
 
-from datetime import datetime
+import json
+from dataclasses import FrozenInstanceError, fields, replace
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
 
 import pytest
 
 from models import Priority, Status, TodoItem
 
+# Immutable, so one instance is safely shared by every test in the module.
+SAMPLE_TODO = TodoItem(
+    id="uuid-1",
+    title="Test Task",
+    details="This is a test task",
+    priority=Priority.HIGH,
+    status=Status.PENDING,
+    owner="testuser",
+    created_at=datetime(2026, 1, 13, 10, 0, 0),
+    updated_at=datetime(2026, 1, 13, 10, 0, 0),
+)
+# Serialized once at import; read-only so no test can alter it for the others.
+SAMPLE_DICT = MappingProxyType(SAMPLE_TODO.to_dict())
 
-class TestPriority:
-    """Tests for the Priority enum."""
 
-    def test_priority_high_value(self) -> None:
-        """Test HIGH priority has correct value."""
-        assert Priority.HIGH.value == "HIGH"
+class _DatetimeSubclass(datetime):
+    """A datetime subclass, like the fakes that test-clock libraries return."""
 
-    def test_priority_mid_value(self) -> None:
-        """Test MID priority has correct value."""
-        assert Priority.MID.value == "MID"
 
-    def test_priority_low_value(self) -> None:
-        """Test LOW priority has correct value."""
-        assert Priority.LOW.value == "LOW"
+class TestPriority:
+    """Tests for the Priority enum."""
+
+    @pytest.mark.parametrize(
+        "member,value",
+        [(Priority.HIGH, "HIGH"), (Priority.MID, "MID"), (Priority.LOW, "LOW")],
+    )
+    def test_priority_value(self, member: Priority, value: str) -> None:
+        """Test each priority has the correct value."""
+        assert member.value == value
 
     def test_priority_all_members(self) -> None:
-        """Test all priority members exist."""
-        priorities = [p.value for p in Priority]
-        assert "HIGH" in priorities
-        assert "MID" in priorities
-        assert "LOW" in priorities
+        """Test exactly the expected priority members exist."""
+        assert {p.value for p in Priority} == {"HIGH", "MID", "LOW"}
 
 
 class TestStatus:
     """Tests for the Status enum."""
 
-    def test_status_pending_value(self) -> None:
-        """Test PENDING status has correct value."""
-        assert Status.PENDING.value == "PENDING"
-
-    def test_status_completed_value(self) -> None:
-        """Test COMPLETED status has correct value."""
-        assert Status.COMPLETED.value == "COMPLETED"
+    @pytest.mark.parametrize(
+        "member,value",
+        [(Status.PENDING, "PENDING"), (Status.COMPLETED, "COMPLETED")],
+    )
+    def test_status_value(self, member: Status, value: str) -> None:
+        """Test each status has the correct value."""
+        assert member.value == value
 
     def test_status_all_members(self) -> None:
-        """Test all status members exist."""
-        statuses = [s.value for s in Status]
-        assert "PENDING" in statuses
-        assert "COMPLETED" in statuses
+        """Test exactly the expected status members exist."""
+        assert {s.value for s in Status} == {"PENDING", "COMPLETED"}
 
 
 class TestTodoItem:
     """Tests for the TodoItem dataclass."""
 
-    @pytest.fixture
-    def sample_todo(self) -> TodoItem:
-        """Create a sample TodoItem for testing."""
-        return TodoItem(
-            id="uuid-1",
-            title="Test Task",
-            details="This is a test task",
-            priority=Priority.HIGH,
-            status=Status.PENDING,
-            owner="testuser",
-            created_at=datetime(2026, 1, 13, 10, 0, 0),
-            updated_at=datetime(2026, 1, 13, 10, 0, 0),
-        )
-
-    def test_todoitem_creation(self, sample_todo: TodoItem) -> None:
+    def test_todoitem_creation(self) -> None:
         """Test creating a TodoItem with all fields."""
-        assert sample_todo.id == "uuid-1"
-        assert sample_todo.title == "Test Task"
-        assert sample_todo.details == "This is a test task"
-        assert sample_todo.priority == Priority.HIGH
-        assert sample_todo.status == Status.PENDING
-        assert sample_todo.owner == "testuser"
-
-    def test_todoitem_to_dict(self, sample_todo: TodoItem) -> None:
+        assert SAMPLE_TODO.id == "uuid-1"
+        assert SAMPLE_TODO.title == "Test Task"
+        assert SAMPLE_TODO.details == "This is a test task"
+        assert SAMPLE_TODO.priority == Priority.HIGH
+        assert SAMPLE_TODO.status == Status.PENDING
+        assert SAMPLE_TODO.owner == "testuser"
+
+    def test_todoitem_is_immutable(self) -> None:
+        """Test that TodoItem fields cannot be reassigned."""
+        with pytest.raises(FrozenInstanceError):
+            SAMPLE_TODO.title = "Changed"
+
+    def test_todoitem_uses_slots(self) -> None:
+        """Test that TodoItem stores fields in slots, without an instance dict."""
+        assert not hasattr(SAMPLE_TODO, "__dict__")
+        assert "title" in TodoItem.__slots__
+
+    def test_todoitem_is_hashable(self) -> None:
+        """Test that equal TodoItems collapse to one entry in a set."""
+        copy = TodoItem.from_dict(SAMPLE_DICT)
+        assert {SAMPLE_TODO, copy} == {SAMPLE_TODO}
+
+    def test_todoitem_to_dict(self) -> None:
         """Test serialization to dictionary."""
-        todo_dict = sample_todo.to_dict()
-        assert todo_dict["id"] == "uuid-1"
-        assert todo_dict["title"] == "Test Task"
-        assert todo_dict["details"] == "This is a test task"
-        assert todo_dict["priority"] == "HIGH"
-        assert todo_dict["status"] == "PENDING"
-        assert todo_dict["owner"] == "testuser"
-        assert todo_dict["created_at"] == "2026-01-13T10:00:00"
-        assert todo_dict["updated_at"] == "2026-01-13T10:00:00"
-
-    def test_todoitem_from_dict(self, sample_todo: TodoItem) -> None:
+        assert SAMPLE_DICT == {
+            "id": "uuid-1",
+            "title": "Test Task",
+            "details": "This is a test task",
+            "priority": "HIGH",
+            "status": "PENDING",
+            "owner": "testuser",
+            "created_at": "2026-01-13T10:00:00",
+            "updated_at": "2026-01-13T10:00:00",
+        }
+
+    def test_todoitem_to_dict_emits_enum_members_as_strings(self) -> None:
+        """Test serialization emits the string-valued enum members directly."""
+        assert SAMPLE_DICT["priority"] is Priority.HIGH
+        assert SAMPLE_DICT["status"] is Status.PENDING
+        assert json.dumps(SAMPLE_DICT["priority"]) == '"HIGH"'
+
+    def test_todoitem_to_dict_covers_every_field(self) -> None:
+        """Test serialization emits one key per field, in declaration order."""
+        assert list(SAMPLE_DICT) == [f.name for f in fields(TodoItem)]
+
+    def test_todoitem_from_dict(self) -> None:
         """Test deserialization from dictionary."""
-        todo_dict = sample_todo.to_dict()
-        restored = TodoItem.from_dict(todo_dict)
-
-        assert restored.id == sample_todo.id
-        assert restored.title == sample_todo.title
-        assert restored.details == sample_todo.details
-        assert restored.priority == sample_todo.priority
-        assert restored.status == sample_todo.status
-        assert restored.owner == sample_todo.owner
-        assert restored.created_at == sample_todo.created_at
-        assert restored.updated_at == sample_todo.updated_at
+        restored = TodoItem.from_dict(SAMPLE_DICT)
+
+        assert restored.id == SAMPLE_TODO.id
+        assert restored.title == SAMPLE_TODO.title
+        assert restored.details == SAMPLE_TODO.details
+        assert restored.priority == SAMPLE_TODO.priority
+        assert restored.status == SAMPLE_TODO.status
+        assert restored.owner == SAMPLE_TODO.owner
+        assert restored.created_at == SAMPLE_TODO.created_at
+        assert restored.updated_at == SAMPLE_TODO.updated_at
 
     def test_todoitem_from_dict_with_missing_details(self) -> None:
         """Test creating TodoItem from dict with missing optional details field."""
@@ -115,10 +138,63 @@ class TestTodoItem:
         assert todo.details == ""
         assert todo.title == "Task without details"
 
-    def test_todoitem_round_trip(self, sample_todo: TodoItem) -> None:
+    def test_todoitem_from_dict_parses_full_iso_timestamps(self) -> None:
+        """Test timestamps with fractional seconds and offsets are accepted."""
+        data = {
+            **SAMPLE_DICT,
+            "created_at": "2026-01-13T10:00:00.250000",
+            "updated_at": "2026-01-13T10:00:00+07:00",
+        }
+        todo = TodoItem.from_dict(data)
+        assert todo.created_at == datetime(2026, 1, 13, 10, 0, 0, 250000)
+        assert todo.updated_at.utcoffset() == timedelta(hours=7)
+
+    @pytest.mark.parametrize(
+        "offset",
+        [
+            timedelta(hours=5, minutes=30, seconds=15),
+            timedelta(hours=-3, microseconds=1),
+            timedelta(microseconds=1),
+        ],
+    )
+    def test_todoitem_to_dict_keeps_sub_minute_offsets(self, offset: timedelta) -> None:
+        """Test offsets with seconds or microseconds are serialized in full."""
+        stamp = datetime(2026, 1, 13, 10, 0, 0, tzinfo=timezone(offset))
+        todo = replace(SAMPLE_TODO, created_at=stamp, updated_at=stamp)
+
+        todo_dict = todo.to_dict()
+        assert todo_dict["created_at"] == stamp.isoformat()
+        assert todo_dict["updated_at"] == stamp.isoformat()
+
+    @pytest.mark.parametrize(
+        "stamp",
+        [
+            _DatetimeSubclass(2026, 1, 13, 10, 0, 0),
+            _DatetimeSubclass(2026, 1, 13, 10, 0, 0, 250000, tzinfo=timezone.utc),
+        ],
+    )
+    def test_todoitem_to_dict_formats_datetime_subclasses(
+        self, stamp: datetime
+    ) -> None:
+        """Test datetime subclasses serialize like plain datetimes."""
+        todo = replace(SAMPLE_TODO, created_at=stamp, updated_at=stamp)
+
+        todo_dict = todo.to_dict()
+        assert todo_dict["created_at"] == stamp.isoformat()
+        assert todo_dict["updated_at"] == stamp.isoformat()
+
+    def test_todoitem_from_dict_requires_title(self) -> None:
+        """Test deserialization fails when a required field is missing."""
+        data = {key: value for key, value in SAMPLE_DICT.items() if key != "title"}
+        with pytest.raises(KeyError):
+            TodoItem.from_dict(data)
+
+    def test_todoitem_from_dict_rejects_unknown_priority(self) -> None:
+        """Test deserialization fails for a priority outside the enum."""
+        data = {**SAMPLE_DICT, "priority": "URGENT"}
+        with pytest.raises(ValueError):
+            TodoItem.from_dict(data)
+
+    def test_todoitem_round_trip(self) -> None:
         """Test that to_dict and from_dict preserve all data."""
-        original_dict = sample_todo.to_dict()
-        restored = TodoItem.from_dict(original_dict)
-        restored_dict = restored.to_dict()
-
-        assert original_dict == restored_dict
+        assert TodoItem.from_dict(SAMPLE_TODO.to_dict()) == SAMPLE_TODO